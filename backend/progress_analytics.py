@@ -0,0 +1,325 @@
+import asyncio
+import logging
+import os
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import anyio.to_thread
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10000
+# Upper bound on rows held in memory at once when an export is requested over HTTP
+MAX_BATCH_SIZE = 50000
+# Fewest rows per RecordBatch (and so per Parquet row group), whatever the page size
+MIN_ROWS_PER_BATCH = DEFAULT_BATCH_SIZE
+
+# Columnar layout of one exported progress row (user_progress joined with courses)
+PROGRESS_EXPORT_SCHEMA = pa.schema([
+    ("user_id", pa.string()),
+    ("course_id", pa.string()),
+    ("category", pa.string()),
+    ("difficulty", pa.string()),
+    ("status", pa.string()),
+    ("completion_percentage", pa.int64()),
+    ("time_spent_hours", pa.float64()),
+    ("started_at", pa.timestamp("ms")),
+    ("completed_at", pa.timestamp("ms")),
+    ("created_at", pa.timestamp("ms")),
+    ("updated_at", pa.timestamp("ms")),
+])
+
+PROGRESS_FIELDS = [
+    "user_id", "course_id", "status", "completion_percentage", "time_spent_hours",
+    "started_at", "completed_at", "created_at", "updated_at",
+]
+
+# Category given to progress rows whose course no longer exists
+UNKNOWN_CATEGORY = "unknown"
+
+# Percentage buckets used to locate where unfinished learners stall
+DROP_OFF_BINS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+
+class ExportFormat(str, Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+}
+
+
+# Leading bytes of every Parquet file
+PARQUET_MAGIC = b"PAR1"
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back in chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _write_and_drain(writer, sink: _ChunkSink, batch: pa.RecordBatch) -> bytes:
+    writer.write_batch(batch)
+    return sink.drain()
+
+
+def _open_writer(sink, export_format: ExportFormat):
+    if export_format == ExportFormat.PARQUET:
+        return pq.ParquetWriter(sink, PROGRESS_EXPORT_SCHEMA, compression="zstd")
+    return ipc.new_stream(sink, PROGRESS_EXPORT_SCHEMA)
+
+
+async def _load_course_lookup(db) -> Dict[str, Dict[str, Any]]:
+    """Load the (small) courses collection once so progress rows can be joined in memory."""
+    lookup = {}
+    async for course in db.courses.find({}, {"_id": 0, "id": 1, "category": 1, "difficulty": 1}):
+        lookup[course["id"]] = course
+    return lookup
+
+
+def _rows_to_batch(rows: List[Dict[str, Any]], courses: Dict[str, Dict[str, Any]]) -> Tuple[pa.RecordBatch, int]:
+    """Build a RecordBatch from progress rows, returning it with the number of orphaned rows."""
+    columns: Dict[str, list] = {name: [] for name in PROGRESS_EXPORT_SCHEMA.names}
+    orphaned = 0
+    for row in rows:
+        course = courses.get(row.get("course_id"))
+        if course is None:
+            orphaned += 1
+            course = {"category": UNKNOWN_CATEGORY}
+        for field in PROGRESS_FIELDS:
+            columns[field].append(row.get(field))
+        columns["category"].append(course.get("category"))
+        columns["difficulty"].append(course.get("difficulty"))
+    return pa.RecordBatch.from_pydict(columns, schema=PROGRESS_EXPORT_SCHEMA), orphaned
+
+
+async def iter_progress_batches(db, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[pa.RecordBatch]:
+    """Page through user_progress joined with courses, yielding RecordBatches.
+
+    ``batch_size`` is the Mongo cursor page size. Pages are buffered up to at least
+    ``MIN_ROWS_PER_BATCH`` rows so small pages do not produce tiny Parquet row groups.
+    """
+    courses = await _load_course_lookup(db)
+    projection = {"_id": 0, **{field: 1 for field in PROGRESS_FIELDS}}
+    cursor = db.user_progress.find({}, projection, batch_size=batch_size)
+    rows_per_batch = max(batch_size, MIN_ROWS_PER_BATCH)
+
+    # Building and encoding batches is CPU-bound, so it runs in a worker thread
+    # to keep the event loop free for other requests while an export streams.
+    rows = []
+    orphaned = 0
+    async for row in cursor:
+        rows.append(row)
+        if len(rows) >= rows_per_batch:
+            batch, batch_orphaned = await anyio.to_thread.run_sync(_rows_to_batch, rows, courses)
+            orphaned += batch_orphaned
+            yield batch
+            rows = []
+    if rows:
+        batch, batch_orphaned = await anyio.to_thread.run_sync(_rows_to_batch, rows, courses)
+        orphaned += batch_orphaned
+        yield batch
+    if orphaned:
+        logger.warning(f"{orphaned} progress rows reference missing courses; exported as category '{UNKNOWN_CATEGORY}'")
+
+
+async def stream_progress_export(
+    db,
+    export_format: ExportFormat = ExportFormat.PARQUET,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Encode the progress export batch by batch, yielding bytes as soon as each batch is written."""
+    sink = _ChunkSink()
+    writer = _open_writer(sink, export_format)
+    try:
+        async for batch in iter_progress_batches(db, batch_size):
+            chunk = await anyio.to_thread.run_sync(_write_and_drain, writer, sink, batch)
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+async def export_progress(
+    db,
+    path: Union[str, Path],
+    export_format: ExportFormat = ExportFormat.PARQUET,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write the progress export to a file and return the number of rows written."""
+    row_count = 0
+    with open(path, "wb") as output:
+        writer = _open_writer(output, export_format)
+        try:
+            async for batch in iter_progress_batches(db, batch_size):
+                await anyio.to_thread.run_sync(writer.write_batch, batch)
+                row_count += batch.num_rows
+        finally:
+            writer.close()
+    return row_count
+
+
+def load_progress_frame(path: Union[str, Path]) -> pd.DataFrame:
+    """Load an export (Parquet or Arrow IPC stream) into a DataFrame with categorical string columns.
+
+    The format is detected from the file contents, not its name.
+    """
+    path = Path(path)
+    with open(path, "rb") as source:
+        is_parquet = source.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC
+    if is_parquet:
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = ipc.open_stream(source).read_all()
+    df = table.to_pandas()
+    for column in ("user_id", "course_id", "category", "difficulty", "status"):
+        df[column] = df[column].astype("category")
+    return df
+
+
+# Cohort rollups
+def _fill_unknown(series: pd.Series) -> pd.Series:
+    """Label missing categories explicitly so groupby does not silently drop those rows."""
+    if not series.isna().any():
+        return series
+    if isinstance(series.dtype, pd.CategoricalDtype) and UNKNOWN_CATEGORY not in series.cat.categories:
+        series = series.cat.add_categories(UNKNOWN_CATEGORY)
+    return series.fillna(UNKNOWN_CATEGORY)
+
+
+def completion_rates_by_category(df: pd.DataFrame) -> pd.DataFrame:
+    """Enrolment count, completed count and completion rate per course category."""
+    completed = df["status"].eq("completed").to_numpy()
+    rollup = (
+        pd.Series(completed, index=df.index)
+        .groupby(_fill_unknown(df["category"]), observed=True)
+        .agg(["size", "sum"])
+        .rename(columns={"size": "enrolled", "sum": "completed"})
+    )
+    rollup["completion_rate"] = rollup["completed"] / rollup["enrolled"]
+    return rollup
+
+
+def median_time_to_complete(df: pd.DataFrame) -> pd.DataFrame:
+    """Median calendar days from start to completion, and median logged hours, per course.
+
+    The start is ``started_at``, falling back to ``created_at`` for records that were
+    marked completed without passing through ``in_progress``. ``timed_completions``
+    counts the completions that had a usable start date.
+    """
+    done = df[df["status"].eq("completed").to_numpy()]
+    started = done["started_at"].fillna(done["created_at"])
+    frame = pd.DataFrame({
+        "course_id": done["course_id"],
+        "days_to_complete": (done["completed_at"] - started).dt.total_seconds() / 86400,
+        "time_spent_hours": done["time_spent_hours"],
+    })
+    return frame.groupby("course_id", observed=True).agg(
+        completed=("time_spent_hours", "size"),
+        timed_completions=("days_to_complete", "count"),
+        median_days_to_complete=("days_to_complete", "median"),
+        median_time_spent_hours=("time_spent_hours", "median"),
+    )
+
+
+def drop_off_points(df: pd.DataFrame, bins: Optional[List[int]] = None) -> pd.DataFrame:
+    """Count unfinished learners per course by the completion bucket they stalled in."""
+    bins = bins or DROP_OFF_BINS
+    unfinished = df[df["status"].eq("in_progress").to_numpy()]
+    percentages = unfinished["completion_percentage"].fillna(0).to_numpy()
+    labels = [f"{low}-{high}" for low, high in zip(bins[:-1], bins[1:])]
+    buckets = pd.Categorical.from_codes(
+        np.clip(np.searchsorted(bins, percentages, side="right") - 1, 0, len(labels) - 1),
+        categories=labels,
+    )
+    return (
+        unfinished.groupby([unfinished["course_id"].to_numpy(), buckets], observed=False)
+        .size()
+        .unstack(fill_value=0)
+        .rename_axis(index="course_id", columns="completion_bucket")
+    )
+
+
+def cohort_report(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Compute all cohort rollups over an exported progress frame."""
+    return {
+        "completion_rates_by_category": completion_rates_by_category(df),
+        "median_time_to_complete": median_time_to_complete(df),
+        "drop_off_points": drop_off_points(df),
+    }
+
+
+def _cli():
+    import typer
+
+    cli = typer.Typer(help="Export and summarise OSSU tracker progress data.")
+
+    @cli.command()
+    def export(
+        output: Path,
+        export_format: ExportFormat = typer.Option(ExportFormat.PARQUET, "--format"),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """Stream user_progress joined with courses into a Parquet or Arrow IPC file."""
+        from dotenv import load_dotenv
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        load_dotenv(Path(__file__).parent / '.env')
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        try:
+            db = client[os.environ['DB_NAME']]
+            row_count = asyncio.run(export_progress(db, output, export_format, batch_size))
+        finally:
+            client.close()
+        typer.echo(f"Exported {row_count} progress rows to {output}")
+
+    @cli.command()
+    def rollup(path: Path):
+        """Print cohort metrics for a previously exported file."""
+        df = load_progress_frame(path)
+        for name, frame in cohort_report(df).items():
+            typer.echo(f"\n== {name} ==")
+            typer.echo(frame.to_string())
+
+    cli()
+
+
+if __name__ == "__main__":
+    _cli()
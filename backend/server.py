@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -13,6 +14,13 @@ import re
 import requests
 import json
 from enum import Enum
+from progress_analytics import (
+    DEFAULT_BATCH_SIZE,
+    EXPORT_MEDIA_TYPES,
+    MAX_BATCH_SIZE,
+    ExportFormat,
+    stream_progress_export,
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -344,6 +352,18 @@ async def get_progress_summary():
         "completion_percentage": round((completed_count / total_courses * 100) if total_courses > 0 else 0, 1)
     }
 
+@api_router.get("/analytics/progress/export")
+async def export_progress_data(
+    export_format: ExportFormat = Query(ExportFormat.PARQUET, alias="format"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+):
+    """Stream all progress records joined with their course as a Parquet or Arrow IPC file."""
+    return StreamingResponse(
+        stream_progress_export(db, export_format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="user_progress.{export_format.value}"'}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from progress_analytics import (
+    DEFAULT_BATCH_SIZE,
+    ExportFormat,
+    completion_rates_by_category,
+    drop_off_points,
+    export_progress,
+    load_progress_frame,
+    median_time_to_complete,
+    stream_progress_export,
+)
+
+COLUMNS = [
+    "user_id", "course_id", "category", "status", "completion_percentage",
+    "time_spent_hours", "started_at", "completed_at", "created_at",
+]
+
+
+def make_frame(rows):
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    for column in ("started_at", "completed_at", "created_at"):
+        df[column] = pd.to_datetime(df[column])
+    return df
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None, batch_size=None):
+        return FakeCursor(self.docs)
+
+
+class FakeDB:
+    def __init__(self, courses, progress):
+        self.courses = FakeCollection(courses)
+        self.user_progress = FakeCollection(progress)
+
+
+def test_completion_rates_by_category():
+    df = make_frame([
+        ("u1", "c1", "core_math", "completed", 100, 5.0, None, None, None),
+        ("u2", "c1", "core_math", "in_progress", 40, 2.0, None, None, None),
+        ("u1", "c2", "intro_cs", "completed", 100, 1.0, None, None, None),
+        ("u3", "gone", None, "not_started", 0, 0.0, None, None, None),
+    ])
+
+    rollup = completion_rates_by_category(df)
+
+    assert rollup.to_dict("index") == {
+        "core_math": {"enrolled": 2, "completed": 1, "completion_rate": 0.5},
+        "intro_cs": {"enrolled": 1, "completed": 1, "completion_rate": 1.0},
+        "unknown": {"enrolled": 1, "completed": 0, "completion_rate": 0.0},
+    }
+
+
+def test_completion_rates_by_category_empty():
+    assert completion_rates_by_category(make_frame([])).empty
+
+
+def test_median_time_to_complete_falls_back_to_created_at():
+    df = make_frame([
+        ("u1", "c1", "core_math", "completed", 100, 10.0, "2026-01-01", "2026-01-31", "2025-12-01"),
+        ("u2", "c1", "core_math", "completed", 100, 20.0, None, "2026-01-11", "2026-01-01"),
+        ("u3", "c1", "core_math", "completed", 100, 30.0, None, "2026-01-21", None),
+        ("u4", "c1", "core_math", "in_progress", 50, 99.0, "2026-01-01", None, "2026-01-01"),
+    ])
+
+    rollup = median_time_to_complete(df)
+
+    assert rollup.to_dict("index") == {
+        "c1": {
+            "completed": 3,
+            "timed_completions": 2,
+            "median_days_to_complete": 20.0,
+            "median_time_spent_hours": 20.0,
+        },
+    }
+
+
+def test_median_time_to_complete_empty():
+    assert median_time_to_complete(make_frame([])).empty
+
+
+def test_drop_off_points_bucket_boundaries():
+    df = make_frame([
+        ("u1", "c1", "core_math", "in_progress", -5, 0.0, None, None, None),
+        ("u2", "c1", "core_math", "in_progress", 0, 0.0, None, None, None),
+        ("u3", "c1", "core_math", "in_progress", 10, 0.0, None, None, None),
+        ("u4", "c1", "core_math", "in_progress", 100, 0.0, None, None, None),
+        ("u5", "c1", "core_math", "in_progress", 250, 0.0, None, None, None),
+        ("u6", "c1", "core_math", "completed", 100, 0.0, None, None, None),
+    ])
+
+    rollup = drop_off_points(df)
+
+    assert list(rollup.columns) == [f"{low}-{low + 10}" for low in range(0, 100, 10)]
+    assert rollup.loc["c1"].to_dict() == {
+        "0-10": 2, "10-20": 1, "20-30": 0, "30-40": 0, "40-50": 0,
+        "50-60": 0, "60-70": 0, "70-80": 0, "80-90": 0, "90-100": 2,
+    }
+
+
+def test_drop_off_points_empty():
+    assert drop_off_points(make_frame([])).empty
+
+
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+def test_export_round_trip(tmp_path, export_format):
+    started = datetime(2026, 1, 1)
+    db = FakeDB(
+        courses=[{"id": "c1", "category": "core_math", "difficulty": "beginner"}],
+        progress=[
+            {"user_id": "u1", "course_id": "c1", "status": "completed", "completion_percentage": 100,
+             "time_spent_hours": 4.5, "started_at": started, "completed_at": datetime(2026, 1, 3),
+             "created_at": started, "updated_at": started},
+            {"user_id": "u2", "course_id": "c1", "status": "in_progress", "completion_percentage": 3_000_000_000,
+             "time_spent_hours": 1.0, "started_at": started, "completed_at": None,
+             "created_at": started, "updated_at": started},
+            {"user_id": "u3", "course_id": "deleted", "status": "not_started", "completion_percentage": 0,
+             "time_spent_hours": 0.0, "started_at": None, "completed_at": None,
+             "created_at": started, "updated_at": started},
+        ],
+    )
+    file_path = tmp_path / f"export.{export_format.value}"
+    stream_path = tmp_path / f"stream.{export_format.value}"
+
+    async def run():
+        row_count = await export_progress(db, file_path, export_format, batch_size=2)
+        chunks = [chunk async for chunk in stream_progress_export(db, export_format, batch_size=2)]
+        stream_path.write_bytes(b"".join(chunks))
+        return row_count
+
+    assert asyncio.run(run()) == 3
+    for path in (file_path, stream_path):
+        df = load_progress_frame(path)
+        assert df["user_id"].tolist() == ["u1", "u2", "u3"]
+        assert df["category"].tolist() == ["core_math", "core_math", "unknown"]
+        assert df["difficulty"].tolist()[:2] == ["beginner", "beginner"]
+        assert df["completion_percentage"].tolist() == [100, 3_000_000_000, 0]
+        assert df["completed_at"].iloc[0] == pd.Timestamp("2026-01-03")
+        assert pd.isna(df["started_at"].iloc[2])
+
+
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+def test_load_progress_frame_ignores_file_suffix(tmp_path, export_format):
+    db = FakeDB(
+        courses=[{"id": "c1", "category": "core_math", "difficulty": "beginner"}],
+        progress=[{"user_id": "u1", "course_id": "c1", "status": "in_progress", "completion_percentage": 20}],
+    )
+    path = tmp_path / "export.pq"
+
+    asyncio.run(export_progress(db, path, export_format))
+
+    assert load_progress_frame(path)["user_id"].tolist() == ["u1"]
+
+
+def test_small_batch_size_does_not_shrink_row_groups(tmp_path):
+    db = FakeDB(
+        courses=[{"id": "c1", "category": "core_math", "difficulty": "beginner"}],
+        progress=[
+            {"user_id": f"u{i}", "course_id": "c1", "status": "in_progress", "completion_percentage": 20}
+            for i in range(50)
+        ],
+    )
+    path = tmp_path / "export.parquet"
+
+    asyncio.run(export_progress(db, path, ExportFormat.PARQUET, batch_size=1))
+
+    assert pq.ParquetFile(path).metadata.num_row_groups == 1
+
+
+def test_orphaned_rows_logged_once_per_export(tmp_path, caplog):
+    db = FakeDB(
+        courses=[],
+        progress=[
+            {"user_id": f"u{i}", "course_id": "deleted", "status": "not_started", "completion_percentage": 0}
+            for i in range(2 * DEFAULT_BATCH_SIZE + 1)
+        ],
+    )
+
+    with caplog.at_level(logging.WARNING, logger="progress_analytics"):
+        asyncio.run(export_progress(db, tmp_path / "export.arrow", ExportFormat.ARROW))
+
+    assert [record.getMessage() for record in caplog.records] == [
+        f"{2 * DEFAULT_BATCH_SIZE + 1} progress rows reference missing courses; exported as category 'unknown'"
+    ]